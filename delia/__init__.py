@@ -4,9 +4,10 @@ from .databases import PatientsDatabase
 from .extractors import PatientsDataExtractor, PatientWhoFailed
 from .utils import PatientDataModel
 
-stream_handler = logging.StreamHandler()
-stream_handler.setLevel(logging.WARNING)
-logging.getLogger(__name__).addHandler(stream_handler)
+# As a library, delia should not write to stderr on its own : a NullHandler silences the "no handlers could be
+# found" warning while leaving log routing (and the handler lock contention that comes with duplicate stream
+# handlers) entirely to the application.
+logging.getLogger(__name__).addHandler(logging.NullHandler())
 
 __author__ = "Maxence Larose"
 __version__ = "1.2.7"
@@ -13,7 +13,8 @@
 
 import logging
 import os
-from typing import List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
 
 import h5py
 import json
@@ -21,10 +22,48 @@ import numpy as np
 import SimpleITK as sitk
 
 from delia.extractors.patients_data_extractor import PatientsDataExtractor, PatientWhoFailed
-from delia.utils.data_model import ImageAndSegmentationDataModel
+from delia.utils.data_model import ImageAndSegmentationDataModel, PatientDataModel
 
 _logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+
+    def _json_dumps(obj, default=None) -> bytes:
+        """JSON-encode 'obj' to UTF-8 bytes using orjson's C encoder."""
+        return orjson.dumps(obj, default=default)
+
+except ImportError:
+    def _json_dumps(obj, default=None) -> bytes:
+        """JSON-encode 'obj' to UTF-8 bytes using the standard library encoder."""
+        return json.dumps(obj, default=default).encode("utf-8")
+
+
+try:
+    from numba import njit, prange
+
+    @njit(parallel=True, boundscheck=False, cache=True)
+    def _transpose_zyx_to_yxz(src: np.ndarray, dst: np.ndarray) -> None:
+        """Write the (1, 2, 0) permutation of 'src' into the C-contiguous 'dst' in a single fused pass."""
+        for y in prange(src.shape[1]):
+            for x in range(src.shape[2]):
+                for z in range(src.shape[0]):
+                    dst[y, x, z] = src[z, y, x]
+
+except ImportError:
+    _transpose_zyx_to_yxz = None
+
+_FUSED_TRANSPOSE_MIN_NBYTES = 64 * 1024 ** 2
+
+
+def _next_prime(n: int) -> int:
+    """Smallest prime greater than or equal to 'n'. Used to size the HDF5 chunk cache hash table."""
+    candidate = max(n, 2)
+    while any(candidate % divisor == 0 for divisor in range(2, int(candidate ** 0.5) + 1)):
+        candidate += 1
+
+    return candidate
+
 
 class PatientsDatabase:
     """
@@ -33,14 +72,19 @@ class PatientsDatabase:
     an existing hdf5 file database through queries.
     """
 
+    BIT_PACKED = "Bit_packed"
     DICOM_HEADER = "Dicom_header"
     IMAGE = "Image"
     MODALITY = "Modality"
+    ORIGINAL_LAST_DIM = "Original_last_dim"
     TRANSFORMS = "Transforms"
 
     def __init__(
             self,
             path_to_database: str,
+            rdcc_nbytes: int = 64 * 1024 ** 2,
+            rdcc_nslots: Optional[int] = None,
+            rdcc_w0: float = 0.75
     ):
         """
         Used to initialize the path to the database.
@@ -49,14 +93,29 @@ class PatientsDatabase:
         ----------
         path_to_database : str
             Path to database.
+        rdcc_nbytes : int, default = 64 MB.
+            Size of the HDF5 chunk cache per dataset. The h5py default of 1 MB thrashes as soon as chunking and
+            compression are enabled, since writing or reading a full image needs every chunk of the dataset in cache
+            at once.
+        rdcc_nslots : Optional[int]
+            Number of slots in the chunk cache hash table. Should be a prime roughly 100 times the number of chunks
+            that fit in the cache; by default it is computed from 'rdcc_nbytes' assuming ~1 MB chunks.
+        rdcc_w0 : float, default = 0.75.
+            Chunk preemption policy (0 evicts least recently used chunks first, 1 evicts fully read/written chunks
+            first).
         """
         self.path_to_database = path_to_database
+        self._keys_cache: Optional[List[str]] = None
+
+        if rdcc_nslots is None:
+            rdcc_nslots = _next_prime(100 * (rdcc_nbytes // 1024 ** 2))
+        self._rdcc_kwargs = dict(rdcc_nbytes=rdcc_nbytes, rdcc_nslots=rdcc_nslots, rdcc_w0=rdcc_w0)
 
         if os.path.exists(path_to_database):
             try:
-                self._file = h5py.File(path_to_database, mode="r+")
+                self._file = h5py.File(path_to_database, mode="r+", **self._rdcc_kwargs)
             except OSError:
-                self._file = h5py.File(path_to_database, mode="r")
+                self._file = h5py.File(path_to_database, mode="r", **self._rdcc_kwargs)
         else:
             self._file = None
 
@@ -87,6 +146,47 @@ class PatientsDatabase:
         else:
             self._path_to_database = f"{path_to_database}.h5"
 
+    @property
+    def _keys(self) -> List[str]:
+        """
+        List of the patient IDs found in the database. Listing the keys of the root group walks the HDF5 link
+        B-tree, which is costly on large databases, so the list is built once and cached until the file handle
+        changes (see 'create' and 'close').
+
+        Returns
+        -------
+        keys : List[str]
+            Patient IDs.
+        """
+        if self._keys_cache is None:
+            self._keys_cache = list(self._file.keys())
+
+        return self._keys_cache
+
+    def _patient_id_at(self, index: int) -> str:
+        """
+        Gets the patient ID at the given index. When the key cache is warm it is simply indexed; otherwise a single
+        low-level H5G lookup fetches only the requested link name instead of materializing every key of the root
+        group.
+
+        Parameters
+        ----------
+        index : int
+            Patient index.
+
+        Returns
+        -------
+        patient_id : str
+            Patient ID.
+        """
+        if self._keys_cache is not None:
+            return self._keys_cache[index]
+
+        if index < 0:
+            index += self._file.id.get_num_objs()
+
+        return self._file.id.get_objname_by_idx(index).decode("utf-8")
+
     def __getitem__(self, patient: Union[int, List[int], str, List[str]]) -> Union[List[h5py.Group], h5py.Group]:
         """
         Gets a patient group given the patient ID. This method returns a copy of the patient group.
@@ -98,11 +198,9 @@ class PatientsDatabase:
         """
         if os.path.exists(self.path_to_database):
             if isinstance(patient, int):
-                file_keys = list(self._file.keys())
-                patient = file_keys[patient]
+                patient = self._patient_id_at(patient)
             elif isinstance(patient, list):
-                file_keys = list(self._file.keys())
-                patient = [file_keys[p] if isinstance(p, int) else p for p in patient]
+                patient = [self._patient_id_at(p) if isinstance(p, int) else p for p in patient]
 
             if isinstance(patient, str):
                 return self._file[patient]
@@ -126,10 +224,59 @@ class PatientsDatabase:
             Number of patients in the database.
         """
         if self._file:
-            return len(self._file.keys())
+            return len(self._keys)
         else:
             return 0
 
+    @classmethod
+    def get_dicom_header(cls, series_group: h5py.Group) -> dict:
+        """
+        Gets the DICOM header of a series as a JSON dictionary. The header is stored as a compressed uint8 dataset
+        (see 'create'); variable-length string datasets written by older versions of the database are also handled.
+
+        Parameters
+        ----------
+        series_group : h5py.Group
+            An hdf5 group containing a series, i.e. a group holding a dataset named 'Dicom_header'.
+
+        Returns
+        -------
+        dicom_header : dict
+            DICOM header as a JSON dictionary.
+        """
+        data = series_group[cls.DICOM_HEADER][()]
+
+        if isinstance(data, bytes):
+            return json.loads(data.decode("utf-8"))
+        elif isinstance(data, str):
+            return json.loads(data)
+        else:
+            return json.loads(bytes(data).decode("utf-8"))
+
+    @classmethod
+    def unpack_label_map(cls, data_set: h5py.Dataset) -> np.ndarray:
+        """
+        Gets a label map dataset as a numpy array, unpacking it when it was bit-packed at creation time (see the
+        'bit_pack_label_maps' option of 'create'). Plain int8 label maps are returned unchanged.
+
+        Parameters
+        ----------
+        data_set : h5py.Dataset
+            A label map dataset.
+
+        Returns
+        -------
+        label_map : np.ndarray
+            Label map as a numpy array.
+        """
+        label_map = np.asarray(data_set)
+
+        if data_set.attrs.get(cls.BIT_PACKED, False):
+            original_last_dim = int(data_set.attrs[cls.ORIGINAL_LAST_DIM])
+            label_map = np.unpackbits(label_map, axis=-1)[..., :original_last_dim].astype(np.int8)
+
+        return label_map
+
     def _check_authorization_of_database_creation(
             self,
             overwrite_database: bool
@@ -154,46 +301,57 @@ class PatientsDatabase:
             _logger.info(f"Writing HDF5 database with path : {self.path_to_database}")
 
     @staticmethod
-    def _add_sitk_image_attributes_to_hdf5_group(
-            patient_image_data: ImageAndSegmentationDataModel,
-            group: h5py.Group
-    ) -> None:
+    def _get_sitk_image_attributes(
+            patient_image_data: ImageAndSegmentationDataModel
+    ) -> Dict[str, Union[str, Tuple[float, ...]]]:
         """
-        Add Simple ITK image information as attributes in the given HDF5 group.
+        Get the Simple ITK image information to store as attributes in an HDF5 group. The dictionary is built once
+        per image and written with a single attrs.update call per target group.
 
         Parameters
         ----------
         patient_image_data : ImageAndSegmentationDataModel
             A named tuple grouping the patient data retrieved from his dicom files and the segmentation data retrieved
             from the segmentation file.
-        group : h5py.Group
-            An hdf5 group.
+
+        Returns
+        -------
+        attributes : Dict[str, Union[str, Tuple[float, ...]]]
+            Dictionary of attribute names and values.
         """
-        group.attrs.create(name="Size", data=patient_image_data.image.simple_itk_image.GetSize())
-        group.attrs.create(name="Origin", data=patient_image_data.image.simple_itk_image.GetOrigin())
-        group.attrs.create(name="Spacing", data=patient_image_data.image.simple_itk_image.GetSpacing())
-        group.attrs.create(name="Direction", data=patient_image_data.image.simple_itk_image.GetDirection())
-        group.attrs.create(name="Pixel Type", data=patient_image_data.image.simple_itk_image.GetPixelIDTypeAsString())
+        simple_itk_image = patient_image_data.image.simple_itk_image
+
+        return {
+            "Size": simple_itk_image.GetSize(),
+            "Origin": simple_itk_image.GetOrigin(),
+            "Spacing": simple_itk_image.GetSpacing(),
+            "Direction": simple_itk_image.GetDirection(),
+            "Pixel Type": simple_itk_image.GetPixelIDTypeAsString()
+        }
 
     @staticmethod
-    def _add_dicom_attributes_to_hdf5_group(
+    def _get_dicom_attributes(
             patient_image_data: ImageAndSegmentationDataModel,
-            group: h5py.Group,
             tags_to_use_as_attributes: List[Tuple[int, int]],
-    ) -> None:
+    ) -> Dict[str, str]:
         """
-        Add the specified DICOM tags as attributes in the given HDF5 group.
+        Get the specified DICOM tags to store as attributes in an HDF5 group. The dictionary is built once per image
+        (one DICOM header walk) and written with a single attrs.update call per target group.
 
         Parameters
         ----------
         patient_image_data : ImageAndSegmentationDataModel
             A named tuple grouping the patient data retrieved from his dicom files and the segmentation data retrieved
             from the segmentation file.
-        group : h5py.Group
-            An hdf5 group.
         tags_to_use_as_attributes : List[Tuple[int, int]]
             List of DICOM tags to add as series attributes in the HDF5 database.
+
+        Returns
+        -------
+        attributes : Dict[str, str]
+            Dictionary of attribute names and values.
         """
+        attributes = {}
         for tag in tags_to_use_as_attributes:
             dicom_data_element = patient_image_data.image.dicom_header[tag]
 
@@ -202,12 +360,70 @@ class PatientsDatabase:
             else:
                 data = dicom_data_element.repval
 
-            group.attrs.create(name=dicom_data_element.name, data=data)
+            attributes[dicom_data_element.name] = data
+
+        return attributes
+
+    @staticmethod
+    def _get_default_chunk_shape(
+            array_shape: Tuple[int, ...],
+            itemsize: int,
+            target_chunk_nbytes: int = 1024 ** 2
+    ) -> Tuple[int, ...]:
+        """
+        Compute a default chunk shape for a dataset of the given shape and item size. The chunk shape is obtained by
+        repeatedly halving the largest axis of the array shape until the chunk size is at most approximately 1 MB,
+        which keeps single-slice reads cheap while bounding the HDF5 B-tree size.
+
+        Parameters
+        ----------
+        array_shape : Tuple[int, ...]
+            Shape of the array to store.
+        itemsize : int
+            Size (in bytes) of one array element.
+        target_chunk_nbytes : int, default = 1024 ** 2.
+            Approximate upper bound on the chunk size in bytes.
+
+        Returns
+        -------
+        chunk_shape : Tuple[int, ...]
+            Chunk shape.
+        """
+        chunk_shape = list(array_shape)
+        while np.prod(chunk_shape) * itemsize > target_chunk_nbytes:
+            largest_axis = int(np.argmax(chunk_shape))
+            chunk_shape[largest_axis] = (chunk_shape[largest_axis] + 1) // 2
+
+        return tuple(chunk_shape)
+
+    @staticmethod
+    def _clip_chunk_shape(
+            chunk_shape: Tuple[int, ...],
+            array_shape: Tuple[int, ...]
+    ) -> Tuple[int, ...]:
+        """
+        Clip a chunk shape so that no chunk axis is larger than the corresponding array axis.
+
+        Parameters
+        ----------
+        chunk_shape : Tuple[int, ...]
+            Requested chunk shape.
+        array_shape : Tuple[int, ...]
+            Shape of the array to store.
+
+        Returns
+        -------
+        chunk_shape : Tuple[int, ...]
+            Clipped chunk shape.
+        """
+        return tuple(min(chunk_axis, array_axis) for chunk_axis, array_axis in zip(chunk_shape, array_shape))
 
     @staticmethod
     def _transpose(array: np.ndarray) -> np.ndarray:
         """
-        Transpose an array if its shape is not valid for the hdf5 database format.
+        Transpose an array if its shape is not valid for the hdf5 database format. Note that the result is a
+        non-contiguous view on the input buffer; the caller is responsible for making it C-contiguous exactly once
+        (e.g. via np.ascontiguousarray) before handing it to h5py, which would otherwise do so with a hidden copy.
 
         Parameters
         ----------
@@ -221,6 +437,119 @@ class PatientsDatabase:
         """
         return array.transpose((1, 2, 0))
 
+    @classmethod
+    def _transpose_to_contiguous(cls, array: np.ndarray) -> np.ndarray:
+        """
+        Apply the (1, 2, 0) transpose and return a C-contiguous copy. The numpy path (_transpose followed by
+        np.ascontiguousarray) traverses the volume with a strided read pattern; for large volumes a fused Numba
+        kernel is used instead when numba is installed, which reads and writes each voxel exactly once in a single
+        parallel pass.
+
+        Parameters
+        ----------
+        array : np.ndarray
+            An numpy array.
+
+        Returns
+        -------
+        transposed_array : np.ndarray
+            C-contiguous transposed array.
+        """
+        if (
+                _transpose_zyx_to_yxz is not None
+                and array.ndim == 3
+                and array.nbytes >= _FUSED_TRANSPOSE_MIN_NBYTES
+        ):
+            destination = np.empty((array.shape[1], array.shape[2], array.shape[0]), dtype=array.dtype)
+            _transpose_zyx_to_yxz(array, destination)
+            return destination
+
+        return np.ascontiguousarray(cls._transpose(array))
+
+    @classmethod
+    def _materialize_patient_arrays(
+            cls,
+            patient_dataset: PatientDataModel,
+            transpose: bool,
+            organs_to_keep: Optional[List[str]] = None
+    ) -> List[Tuple[np.ndarray, List[Dict[str, np.ndarray]]]]:
+        """
+        Convert every image and label map of a patient from SimpleITK images to numpy arrays. This is the expensive
+        part of the per-patient work (a large memcpy per volume), so it is kept free of any HDF5 call and can safely
+        run in a background thread while the previous patient is being written. Arrays are built from zero-copy
+        SimpleITK views and made C-contiguous at most once, so each volume is copied a single time instead of once
+        here and once more inside h5py.
+
+        Parameters
+        ----------
+        patient_dataset : PatientDataModel
+            A named tuple grouping the patient's data extracted from its dicom files and the segmentation data
+            extracted from the segmentation files.
+        transpose : bool
+            Transpose the image array before using it.
+        organs_to_keep : Optional[List[str]]
+            Organ segmentations to keep in the database. Label maps of discarded organs are skipped before any
+            conversion so their cost is never paid. By default, all organs are kept.
+
+        Returns
+        -------
+        materialized_arrays : List[Tuple[np.ndarray, List[Dict[str, np.ndarray]]]]
+            For each image of the patient, the image array and, for each of its segmentations, a dictionary mapping
+            organ names to label map arrays.
+        """
+        materialized_arrays = []
+        for patient_image_data in patient_dataset.data:
+            image_view = sitk.GetArrayViewFromImage(patient_image_data.image.simple_itk_image)
+            if transpose is True:
+                image_array = cls._transpose_to_contiguous(image_view)
+            else:
+                image_array = np.ascontiguousarray(image_view)
+
+            label_map_arrays = []
+            if patient_image_data.segmentations:
+                for segmentation in patient_image_data.segmentations:
+                    organ_arrays = {}
+                    for organ, simple_itk_label_map in segmentation.simple_itk_label_maps.items():
+                        if organs_to_keep is not None and organ not in organs_to_keep:
+                            continue
+
+                        label_map_view = sitk.GetArrayViewFromImage(simple_itk_label_map)
+                        if transpose is True:
+                            organ_arrays[organ] = cls._transpose_to_contiguous(label_map_view)
+                        else:
+                            organ_arrays[organ] = np.ascontiguousarray(label_map_view)
+                    label_map_arrays.append(organ_arrays)
+
+            materialized_arrays.append((image_array, label_map_arrays))
+
+        return materialized_arrays
+
+    @classmethod
+    def _serialize_transforms_history(cls, patient_dataset: PatientDataModel) -> Dict[str, bytes]:
+        """
+        Serialize a patient's transforms history into the attribute dictionary stored on its group. Serialization
+        goes through a per-object 'default' callback and is CPU-heavy for SimpleITK transforms, so it is kept free
+        of any HDF5 call and can run in a background thread while datasets are being written.
+
+        Parameters
+        ----------
+        patient_dataset : PatientDataModel
+            A named tuple grouping the patient's data extracted from its dicom files and the segmentation data
+            extracted from the segmentation files.
+
+        Returns
+        -------
+        transforms_attributes : Dict[str, bytes]
+            Dictionary of attribute names and JSON-encoded transforms.
+        """
+        return {
+            f"{cls.TRANSFORMS}_{idx}": _json_dumps(
+                transform,
+                default=patient_dataset.transforms_history.serialize
+            )
+            for idx, transform in enumerate(patient_dataset.transforms_history.history)
+        }
+
     def create(
             self,
             patients_data_extractor: PatientsDataExtractor,
@@ -229,7 +558,12 @@ class PatientsDatabase:
             organs_to_keep: Optional[Union[str, List[str]]] = None,
             overwrite_database: bool = False,
             transpose: bool = True,
-            shallow_hierarchy: bool = False
+            shallow_hierarchy: bool = False,
+            chunk_shape: Optional[Tuple[int, int, int]] = None,
+            compression: Optional[str] = "gzip",
+            compression_opts: Optional[int] = 1,
+            shuffle: bool = True,
+            bit_pack_label_maps: bool = False
     ) -> List[PatientWhoFailed]:
         """
         Create an hdf5 file database from multiple patients dicom files and their segmentation. The goal is to create
@@ -253,6 +587,26 @@ class PatientsDatabase:
             Transpose the image array before using it.
         shallow_hierarchy : bool, default = False.
             Creates database with shallow hierarchy.
+        chunk_shape : Optional[Tuple[int, int, int]]
+            Chunk shape used for the image and label map datasets, given in the dataset axis order (i.e. after the
+            transpose when 'transpose' is True). By default, a chunk shape is computed per dataset so that each chunk
+            is approximately 1 MB, which makes single-slice reads touch a bounded number of chunks instead of the
+            whole contiguous volume.
+        compression : Optional[str], default = "gzip".
+            Compression filter applied to the image and label map datasets. Shuffle + gzip at a low level typically
+            shrinks medical image databases several-fold at modest CPU cost; "lzf" is faster for write-heavy
+            pipelines at a lower compression ratio. Use None to store the arrays uncompressed.
+        compression_opts : Optional[int], default = 1.
+            Compression level when 'compression' is "gzip". Highly redundant data such as segmentation masks benefit
+            from higher levels (e.g. 4). Ignored for other filters.
+        shuffle : bool, default = True.
+            Apply the byte-shuffle filter before compression, which groups bytes of the same significance together
+            and substantially improves the compression ratio.
+        bit_pack_label_maps : bool, default = False.
+            Store binary label maps bit-packed along their last axis (np.packbits), i.e. 8 voxels per byte, which
+            shrinks both the bytes written and the compression work by 8x. Packed datasets carry 'Bit_packed' and
+            'Original_last_dim' attributes and must be read back through 'unpack_label_map'. Multi-class label maps
+            are stored as int8 regardless of this option.
 
         Returns
         -------
@@ -267,10 +621,33 @@ class PatientsDatabase:
         if isinstance(organs_to_keep, str):
             organs_to_keep = [organs_to_keep]
 
-        with h5py.File(self.path_to_database, "w") as file:
+        compression_kwargs = dict(compression=compression, shuffle=shuffle) if compression else dict(shuffle=False)
+        if compression == "gzip":
+            compression_kwargs["compression_opts"] = compression_opts
+
+        file = self._file = h5py.File(self.path_to_database, "w", libver="latest", **self._rdcc_kwargs)
+        self._keys_cache = None
+        executor = ThreadPoolExecutor(max_workers=2)
+        try:
             patients_data_extractor.reset()
             number_of_patients = len(patients_data_extractor)
-            for patient_idx, patient_dataset in enumerate(patients_data_extractor):
+            patients_iterator = iter(patients_data_extractor)
+            patient_idx, patient_dataset = 0, next(patients_iterator, None)
+            if patient_dataset is not None:
+                materialized_future = executor.submit(
+                    self._materialize_patient_arrays, patient_dataset, transpose, organs_to_keep
+                )
+                transforms_future = executor.submit(self._serialize_transforms_history, patient_dataset)
+            while patient_dataset is not None:
+                materialized_arrays = materialized_future.result()
+                current_transforms_future = transforms_future
+                next_patient_dataset = next(patients_iterator, None)
+                if next_patient_dataset is not None:
+                    materialized_future = executor.submit(
+                        self._materialize_patient_arrays, next_patient_dataset, transpose, organs_to_keep
+                    )
+                    transforms_future = executor.submit(self._serialize_transforms_history, next_patient_dataset)
+
                 patient_id = patient_dataset.patient_id
                 patient_path = patient_dataset.patient_path
 
@@ -280,6 +657,7 @@ class PatientsDatabase:
                     patient_group = file.create_group(name=patient_id)
 
                 for image_idx, patient_image_data in enumerate(patient_dataset.data):
+                    image_array, label_map_arrays = materialized_arrays[image_idx]
 
                     if shallow_hierarchy is True:
                         series_group = patient_group
@@ -288,84 +666,108 @@ class PatientsDatabase:
                         series_group = patient_group.create_group(name=str(image_idx))
                         image_name = self.IMAGE
 
-                    self._add_dicom_attributes_to_hdf5_group(
-                        patient_image_data, series_group, tags_to_use_as_attributes
-                    )
+                    dicom_attributes = self._get_dicom_attributes(patient_image_data, tags_to_use_as_attributes)
+                    series_group.attrs.update(dicom_attributes)
 
                     if add_sitk_image_metadata_as_attributes:
-                        self._add_sitk_image_attributes_to_hdf5_group(patient_image_data, series_group)
+                        sitk_image_attributes = self._get_sitk_image_attributes(patient_image_data)
+                        series_group.attrs.update(sitk_image_attributes)
 
+                    dicom_header_blob = np.frombuffer(
+                        _json_dumps(patient_image_data.image.dicom_header.to_json_dict()),
+                        dtype=np.uint8
+                    )
                     series_group.create_dataset(
                         name=self.DICOM_HEADER,
-                        data=json.dumps(patient_image_data.image.dicom_header.to_json_dict())
+                        data=dicom_header_blob,
+                        chunks=(min(dicom_header_blob.size, 65536),),
+                        compression="gzip",
+                        compression_opts=1
                     )
 
-                    if transpose is True:
-                        image_array = self._transpose(sitk.GetArrayFromImage(patient_image_data.image.simple_itk_image))
+                    if chunk_shape is None:
+                        image_chunk_shape = self._get_default_chunk_shape(
+                            array_shape=image_array.shape,
+                            itemsize=image_array.dtype.itemsize
+                        )
                     else:
-                        image_array = sitk.GetArrayFromImage(patient_image_data.image.simple_itk_image)
+                        image_chunk_shape = self._clip_chunk_shape(chunk_shape, image_array.shape)
 
                     data_set = series_group.create_dataset(
                         name=image_name,
-                        data=self._transpose(image_array)
+                        shape=image_array.shape,
+                        dtype=image_array.dtype,
+                        chunks=image_chunk_shape,
+                        **compression_kwargs
                     )
+                    data_set.write_direct(image_array)
 
                     if shallow_hierarchy is True:
-                        self._add_dicom_attributes_to_hdf5_group(
-                            patient_image_data,
-                            data_set,
-                            tags_to_use_as_attributes
-                        )
+                        data_set.attrs.update(dicom_attributes)
                         if add_sitk_image_metadata_as_attributes:
-                            self._add_sitk_image_attributes_to_hdf5_group(patient_image_data, data_set)
+                            data_set.attrs.update(sitk_image_attributes)
 
                     if patient_image_data.segmentations:
                         for segmentation_idx, segmentation in enumerate(patient_image_data.segmentations):
                             segmentation_group = series_group.create_group(name=str(segmentation_idx))
                             segmentation_group.attrs.create(name=self.MODALITY, data=segmentation.modality)
 
-                            for organ, simple_itk_label_map in segmentation.simple_itk_label_maps.items():
-                                if transpose is True:
-                                    numpy_array_label_map = self._transpose(
-                                        sitk.GetArrayFromImage(simple_itk_label_map)
+                            for organ, numpy_array_label_map in label_map_arrays[segmentation_idx].items():
+                                bit_pack = bit_pack_label_maps and numpy_array_label_map.max() <= 1
+                                if bit_pack:
+                                    original_last_dim = numpy_array_label_map.shape[-1]
+                                    numpy_array_label_map = np.packbits(
+                                        numpy_array_label_map.astype(np.uint8), axis=-1
                                     )
-                                else:
-                                    numpy_array_label_map = sitk.GetArrayFromImage(simple_itk_label_map)
 
-                                if organs_to_keep is None or organ in organs_to_keep:
-                                    segmentation_group.create_dataset(
-                                        name=organ,
-                                        data=numpy_array_label_map,
-                                        dtype=np.int8
+                                if chunk_shape is None:
+                                    label_map_chunk_shape = self._get_default_chunk_shape(
+                                        array_shape=numpy_array_label_map.shape,
+                                        itemsize=np.dtype(np.int8).itemsize
+                                    )
+                                else:
+                                    label_map_chunk_shape = self._clip_chunk_shape(
+                                        chunk_shape, numpy_array_label_map.shape
                                     )
 
-                for idx, transform in enumerate(patient_dataset.transforms_history.history):
-                    if shallow_hierarchy is True:
-                        data_set.attrs.create(
-                            name=f"{self.TRANSFORMS}_{idx}",
-                            data=json.dumps(
-                            obj=transform,
-                            default=patient_dataset.transforms_history.serialize
-                            )
-                        )
-                    else:
-                        patient_group.attrs.create(
-                            name=f"{self.TRANSFORMS}_{idx}",
-                            data=json.dumps(
-                                obj=transform,
-                                default=patient_dataset.transforms_history.serialize
-                            )
-                        )
+                                label_map_data_set = segmentation_group.create_dataset(
+                                    name=organ,
+                                    data=numpy_array_label_map,
+                                    dtype=np.uint8 if bit_pack else np.int8,
+                                    chunks=label_map_chunk_shape,
+                                    **compression_kwargs
+                                )
+
+                                if bit_pack:
+                                    label_map_data_set.attrs[self.BIT_PACKED] = True
+                                    label_map_data_set.attrs[self.ORIGINAL_LAST_DIM] = original_last_dim
+
+                transforms_attributes = current_transforms_future.result()
+                if shallow_hierarchy is True:
+                    data_set.attrs.update(transforms_attributes)
+                else:
+                    patient_group.attrs.update(transforms_attributes)
 
                 _logger.info(f"Progress : {patient_idx + 1}/{number_of_patients} patients added to database.")
 
+                patient_idx, patient_dataset = patient_idx + 1, next_patient_dataset
+
             patients_data_extractor.close()
             patients_data_extractor.reset()
-
-        try:
-            self._file = h5py.File(self.path_to_database, mode="r+")
-        except OSError:
-            self._file = h5py.File(self.path_to_database, mode="r")
+        except BaseException:
+            # A half-written database must not keep an open handle in truncating 'w' mode : a retry with
+            # 'overwrite_database=True' in the same process would then fail on HDF5 file locking instead of
+            # recreating the file, and flushing a handle broken by an I/O error could mask the original exception.
+            try:
+                file.close()
+            except Exception:
+                pass
+            self._file = None
+            raise
+        else:
+            file.flush()
+        finally:
+            executor.shutdown(wait=True)
 
         return patients_data_extractor.patients_who_failed
 
@@ -375,6 +777,7 @@ class PatientsDatabase:
         """
         if self._file:
             self._file.close()
+        self._keys_cache = None
 
     def __del__(self):
         """
@@ -1,24 +1,27 @@
 """
-    @file:              patients_data_generator.py
+    @file:              patients_data_extractor.py
     @Author:            Maxence Larose
 
     @Creation Date:     10/2021
     @Last modification: 10/2022
 
-    @Description:       This file contains the PatientsDataGenerator class which is used to iterate on multiple
+    @Description:       This file contains the PatientsDataExtractor class which is used to iterate on multiple
                         patients' dicom files and segmentation files using the PatientDataReader to obtain all patients'
-                        data. The PatientsDataGenerator inherits from the Generator abstract class.
+                        data. The PatientsDataExtractor inherits from the Generator abstract class.
 """
 
+from collections import deque
 from collections.abc import Generator
-from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
 import json
 import logging
 import os
+import sys
 from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 
 from monai.transforms import Compose
 from monai.transforms import MapTransform as MonaiMapTransform
+from pydicom.datadict import keyword_for_tag
 
 from delia.readers.patient_data.patient_data_reader import PatientDataReader
 from delia.transforms.data.transform import DataTransform
@@ -27,6 +30,24 @@ from delia.utils.data_model import PatientDataModel
 
 _logger = logging.getLogger(__name__)
 
+_VALID_TRANSFORM_TYPES = (DataTransform, PhysicalSpaceTransform, MonaiMapTransform)
+
+try:
+    import orjson
+
+    def _json_dumps_pretty(obj) -> bytes:
+        """JSON-encode 'obj' to indented UTF-8 bytes using orjson's C encoder."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _json_loads = orjson.loads
+
+except ImportError:
+    def _json_dumps_pretty(obj) -> bytes:
+        """JSON-encode 'obj' to indented UTF-8 bytes using the standard library encoder."""
+        return json.dumps(obj, ensure_ascii=False, indent=4).encode("utf-8")
+
+    _json_loads = json.loads
+
 
 class PatientWhoFailed(NamedTuple):
     id: str
@@ -37,7 +58,7 @@ class PatientWhoFailed(NamedTuple):
 class PatientsDataExtractor(Generator):
     """
     A class used to iterate on multiple patients' dicom files and segmentation files using the PatientDataReader to
-    obtain all patients' data. The PatientsDataGenerator inherits from the Generator abstract class.
+    obtain all patients' data. The PatientsDataExtractor inherits from the Generator abstract class.
     """
 
     def __init__(
@@ -48,7 +69,8 @@ class PatientsDataExtractor(Generator):
             load_segmentations: bool = True,
             organs: Optional[List[str]] = None,
             transforms: Optional[Union[Compose, DataTransform, MonaiMapTransform, PhysicalSpaceTransform]] = None,
-            erase_unused_dicom_files: bool = False
+            erase_unused_dicom_files: bool = False,
+            num_workers: int = 1
     ) -> None:
         """
         Used to get the paths to the images and segmentations folders. Also used to check if either the tag values or
@@ -79,13 +101,21 @@ class PatientsDataExtractor(Generator):
             assumed to be modalities.
         erase_unused_dicom_files: bool = False
             Whether to delete unused DICOM files or not. Use with EXTREME caution!
+        num_workers : int = 1
+            Number of patients read concurrently by a thread pool. Reading a patient is both disk-bound and
+            CPU-bound in C extensions that release the GIL (pydicom, SimpleITK), so a few workers hide most of the
+            read latency. Note that with more than one worker, readers in flight may not see tag value updates
+            discovered by the patients currently being consumed; use the default of 1 if the tag value dictionary is
+            built incrementally across patients.
         """
         self._path_to_patients_folder = path_to_patients_folder
         self._erase_unused_dicom_files = erase_unused_dicom_files
+        self._num_workers = num_workers
         self._load_segmentations = load_segmentations
         self._organs = organs
         self._transforms = self._validate_transforms(transforms)
-        self.tag = tag
+        self.tag = self._validate_tag(tag)
+        self._tag_values_dirty = False
 
         if isinstance(tag_values, str):
             self.path_to_tag_value_json = tag_values
@@ -103,6 +133,12 @@ class PatientsDataExtractor(Generator):
 
         self._current_index = 0
         self._patients_who_failed = []
+        self._paths_to_patients_folders_cache = None
+        self._executor = None
+        self._reader_futures = deque()
+        self._submitted_index = 0
+        self._tag_values_dirty = False
+        self._generator = None
 
     def __len__(self) -> int:
         """
@@ -118,22 +154,21 @@ class PatientsDataExtractor(Generator):
     @property
     def paths_to_patients_folders(self) -> List[str]:
         """
-        Get a list of paths to the patients' folders.
+        Get a list of paths to the patients' folders. The folder is only scanned once; the list is cached until
+        'reset' is called, since send() accesses it several times per patient.
 
         Returns
         -------
         paths_to_patients_folders : List[str]
             A list of paths to the folders containing the patients' data.
         """
-        paths_to_folders = []
-        for patient_folder_name in os.listdir(self._path_to_patients_folder):
-            path_to_folder = os.path.join(
-                self._path_to_patients_folder,
-                patient_folder_name
-            )
-            paths_to_folders.append(path_to_folder)
+        if self._paths_to_patients_folders_cache is None:
+            with os.scandir(self._path_to_patients_folder) as entries:
+                self._paths_to_patients_folders_cache = sorted(
+                    entry.path for entry in entries if entry.is_dir()
+                )
 
-        return paths_to_folders
+        return self._paths_to_patients_folders_cache
 
     @property
     def tag_values(self) -> Dict[str, List[str]]:
@@ -161,18 +196,26 @@ class PatientsDataExtractor(Generator):
             from the patient's file. Keys are arbitrary names given to the images we want to add and values are lists of
             values associated with the specified tag.
         """
-        items = list(tag_values.items())
-        for previous_items, current_items in zip(items, items[1:]):
-            set_intersection = set(previous_items[1]) & set(current_items[1])
-
-            if bool(set_intersection):
-                raise AssertionError(
-                    f"\nThe dictionary of tag values should not contain the same series names for different "
-                    f"images/modalities. \nHowever, here we find the series names {previous_items[1]} for the "
-                    f"{previous_items[0]} image and {current_items[1]} for the {current_items[0]} image. \nClearly, "
-                    f"the images series values are overlapping because of the series named {set_intersection}."
-                )
+        # Readers hand back the very dictionary they were given when no new series were discovered; re-validating
+        # it would repeat the whole overlap scan for nothing.
+        if tag_values is getattr(self, "_tag_values", None):
+            return
+
+        seen_series_names = {}
+        for image_name, series_names in tag_values.items():
+            for series_name in series_names:
+                if series_name in seen_series_names:
+                    raise AssertionError(
+                        f"\nThe dictionary of tag values should not contain the same series names for different "
+                        f"images/modalities. \nHowever, here we find the series names {tag_values[seen_series_names[series_name]]} "
+                        f"for the {seen_series_names[series_name]} image and {series_names} for the {image_name} "
+                        f"image. \nClearly, the images series values are overlapping because of the series named "
+                        f"{series_name}."
+                    )
+                seen_series_names[series_name] = image_name
 
+        if tag_values != getattr(self, "_tag_values", None):
+            self._tag_values_dirty = True
         self._tag_values = tag_values
 
     @property
@@ -198,8 +241,8 @@ class PatientsDataExtractor(Generator):
         path_to_tag_value_json : str
             Path to the json dictionary that contains the tag values.
         """
-        with open(path_to_tag_value_json, "r") as json_file:
-            self.tag_values = deepcopy(json.load(json_file))
+        with open(path_to_tag_value_json, "rb") as json_file:
+            self.tag_values = _json_loads(json_file.read())
 
         self._path_to_tag_value_json = path_to_tag_value_json
 
@@ -217,12 +260,57 @@ class PatientsDataExtractor(Generator):
         """
         return self._patients_who_failed
 
+    @property
+    def transforms(self) -> Optional[Union[Compose, DataTransform, PhysicalSpaceTransform, MonaiMapTransform]]:
+        """
+        The validated transforms. The object is validated and its 'allow_missing_keys' flags are frozen exactly once,
+        at construction time; every patient then receives this same object by reference, so any state the transforms
+        cache internally (e.g. per-geometry precomputation) is shared across patients. It is deliberately read-only :
+        rebinding it mid-run would silently skip validation and discard those caches.
+
+        Returns
+        -------
+        transforms : Optional[Union[Compose, DataTransform, MonaiMapTransform, PhysicalSpaceTransform]]
+            A sequence of transformations to apply. PhysicalSpaceTransform are applied in the physical space, i.e on
+            the SimpleITK image, while MonaiMapTransform are applied in the array space, i.e on the numpy array that
+            represents the image. DataTransform transforms the data using other a patient's other images or
+            segmentations.
+        """
+        return self._transforms
+
+    @staticmethod
+    def _validate_tag(tag: Union[str, Tuple[int, int]]) -> str:
+        """
+        Validate the tag and resolve it to its canonical DICOM keyword. Resolving once here means the readers can
+        look the tag up by keyword on every DICOM file without repeating the tuple-to-keyword translation per file.
+
+        Parameters
+        ----------
+        tag : Union[str, Tuple[int, int]]
+            Keyword or tuple of the DICOM tag to use while selecting which files to extract.
+
+        Returns
+        -------
+        tag : str
+            Keyword of the DICOM tag.
+        """
+        if isinstance(tag, str):
+            return tag
+
+        keyword = keyword_for_tag(tag)
+        if not keyword:
+            raise AssertionError(f"The given tag {tag} doesn't correspond to any known DICOM keyword.")
+
+        return keyword
+
     @staticmethod
     def _validate_transforms(
             transforms: Union[Compose, DataTransform, PhysicalSpaceTransform, MonaiMapTransform]
     ) -> Optional[Union[Compose, DataTransform, PhysicalSpaceTransform, MonaiMapTransform]]:
         """
-        Validate transforms type and set allow_missing_keys attributes to True.
+        Validate transforms type and set allow_missing_keys attributes to True. This runs exactly once, at
+        construction time : the returned object is then passed to every patient by reference (see the 'transforms'
+        property), so neither the validation loop nor the flag assignments are repeated per patient.
 
         Parameters
         ----------
@@ -248,14 +336,14 @@ class PatientsDataExtractor(Generator):
             return transforms
         elif isinstance(transforms, Compose):
             for t in transforms.transforms:
-                if not isinstance(t, (DataTransform, PhysicalSpaceTransform, MonaiMapTransform)):
+                if not isinstance(t, _VALID_TRANSFORM_TYPES):
                     raise AssertionError(
                         "The given transforms must inherit from 'DataTransform', 'PhysicalSpaceTransform' or "
                         "'MonaiMapTransform'."
                     )
                 t.allow_missing_keys = True
             return transforms
-        elif isinstance(transforms, (DataTransform, PhysicalSpaceTransform, MonaiMapTransform)):
+        elif isinstance(transforms, _VALID_TRANSFORM_TYPES):
             transforms.allow_missing_keys = True
             return transforms
         else:
@@ -273,8 +361,47 @@ class PatientsDataExtractor(Generator):
         path : str
             Path to the json dictionary that will contain the tag values.
         """
-        with open(path, 'w', encoding='utf-8') as json_file:
-            json.dump(self.tag_values, json_file, ensure_ascii=False, indent=4)
+        with open(path, 'wb') as json_file:
+            json_file.write(_json_dumps_pretty(self.tag_values))
+        self._tag_values_dirty = False
+
+    def _read_patient(self, path_to_patient_folder: str) -> PatientDataReader:
+        """
+        Reads a single patient's dicom files and segmentation files.
+
+        Parameters
+        ----------
+        path_to_patient_folder : str
+            The path to the folder containing the patient's data.
+
+        Returns
+        -------
+        patient_data_reader : PatientDataReader
+            The patient's data reader.
+        """
+        return PatientDataReader(
+            path_to_patient_folder=path_to_patient_folder,
+            tag_values=self.tag_values,
+            tag=self.tag,
+            load_segmentations=self._load_segmentations,
+            organs=self._organs,
+            erase_unused_dicom_files=self._erase_unused_dicom_files
+        )
+
+    def _fill_reader_pipeline(self) -> None:
+        """
+        Submits patient reads to the thread pool until 'num_workers' reads are in flight. A process pool would not
+        work here since neither pydicom datasets nor SimpleITK images can be pickled back to the main process.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._num_workers)
+
+        paths_to_patients_folders = self.paths_to_patients_folders
+        while len(self._reader_futures) < self._num_workers and self._submitted_index < len(paths_to_patients_folders):
+            self._reader_futures.append(
+                self._executor.submit(self._read_patient, paths_to_patients_folders[self._submitted_index])
+            )
+            self._submitted_index += 1
 
     def reset(self) -> None:
         """
@@ -282,6 +409,85 @@ class PatientsDataExtractor(Generator):
         """
         self._current_index = 0
         self._patients_who_failed = []
+        self._paths_to_patients_folders_cache = None
+        for future in self._reader_futures:
+            future.cancel()
+        self._reader_futures.clear()
+        self._submitted_index = 0
+        self._generator = None
+
+    def _generate(self) -> Generator:
+        """
+        Native generator function yielding each patient's dataset in folder order. Running the loop as a true
+        generator keeps the per-patient state on a suspended frame instead of re-dispatching through the Generator
+        ABC machinery on every step.
+
+        Yields
+        ------
+        patient_dataset : PatientDataModel
+            A named tuple grouping the patient's data extracted from its dicom files and the patient's medical image
+            segmentation data extracted from the segmentation files.
+        """
+        paths_to_patients_folders = self.paths_to_patients_folders
+        number_of_patients = len(paths_to_patients_folders)
+        while self._current_index < number_of_patients:
+            _logger.info("Downloading Patient %d/%d", self._current_index + 1, number_of_patients)
+            _logger.info("Path to patient folder : %s", paths_to_patients_folders[self._current_index])
+
+            if self._num_workers > 1:
+                self._fill_reader_pipeline()
+                patient_data_reader = self._reader_futures.popleft().result()
+                # Refill right away so the next patients' reads run while this patient is being transformed and
+                # consumed downstream, not just while it is being waited on.
+                self._fill_reader_pipeline()
+            else:
+                patient_data_reader = self._read_patient(paths_to_patients_folders[self._current_index])
+
+            if self._tag_values is not None and patient_data_reader.tag_values is not self._tag_values:
+                self.tag_values = patient_data_reader.tag_values
+            if self.path_to_tag_value_json and self._tag_values_dirty:
+                self.save_tag_values_to_json(path=self._path_to_tag_value_json)
+            if patient_data_reader.failed_images:
+                # The same few series names come back for most failing patients, so the stored strings are interned
+                # to share a single object across the whole patients_who_failed structure.
+                tag_values = self._tag_values
+                failed_images = {
+                    sys.intern(image): [sys.intern(value) for value in tag_values[image]]
+                    for image in patient_data_reader.failed_images
+                }
+
+                self._patients_who_failed.append(
+                    PatientWhoFailed(
+                        id=patient_data_reader.patient_id,
+                        failed_images=failed_images,
+                        available_tag_values=[
+                            sys.intern(value) for value in patient_data_reader.available_tag_values
+                        ]
+                    )
+                )
+
+            self._current_index += 1
+
+            yield patient_data_reader.get_patient_dataset(transforms=self._transforms)
+
+    def __next__(self) -> PatientDataModel:
+        """
+        Returns the next patient dataset. Defined explicitly so iteration drives the native generator directly; the
+        Generator ABC's default __next__ would route every step through send(None), an extra Python call per patient.
+
+        Returns
+        -------
+        patient_dataset : PatientDataModel
+            A named tuple grouping the patient's data extracted from its dicom files and the patient's medical image
+            segmentation data extracted from the segmentation files.
+        """
+        if self._generator is None:
+            self._generator = self._generate()
+
+        try:
+            return next(self._generator)
+        except StopIteration:
+            self.throw()
 
     def send(self, _) -> PatientDataModel:
         """
@@ -295,42 +501,18 @@ class PatientsDataExtractor(Generator):
             A named tuple grouping the patient's data extracted from its dicom files and the patient's medical image
             segmentation data extracted from the segmentation files.
         """
-        if self._current_index == len(self):
-            self.throw()
-
-        _logger.info(f"Downloading Patient {self._current_index + 1}/{len(self)}")
-        _logger.info(f"Path to patient folder : {self.paths_to_patients_folders[self._current_index]}")
-
-        patient_data_reader = PatientDataReader(
-            path_to_patient_folder=self.paths_to_patients_folders[self._current_index],
-            tag_values=self.tag_values,
-            tag=self.tag,
-            load_segmentations=self._load_segmentations,
-            organs=self._organs,
-            erase_unused_dicom_files=self._erase_unused_dicom_files
-        )
+        if self._generator is None:
+            self._generator = self._generate()
 
-        if self._tag_values is not None:
-            self.tag_values = patient_data_reader.tag_values
-        if self.path_to_tag_value_json:
-            self.save_tag_values_to_json(path=self._path_to_tag_value_json)
-        if patient_data_reader.failed_images:
-            failed_images = {image: self.tag_values[image] for image in patient_data_reader.failed_images}
-
-            self._patients_who_failed.append(
-                PatientWhoFailed(
-                    id=patient_data_reader.patient_id,
-                    failed_images=failed_images,
-                    available_tag_values=patient_data_reader.available_tag_values
-                )
-            )
-
-        self._current_index += 1
-
-        return patient_data_reader.get_patient_dataset(transforms=self._transforms)
+        try:
+            return next(self._generator)
+        except StopIteration:
+            self.throw()
 
     def throw(self, typ: Exception = StopIteration, value=None, traceback=None) -> None:
         """
-        Raises an exception of type typ.
+        Raises an exception of type typ, flushing any pending tag values update to the json file beforehand.
         """
+        if self.path_to_tag_value_json and self._tag_values_dirty:
+            self.save_tag_values_to_json(path=self._path_to_tag_value_json)
         raise typ
@@ -1,6 +1,16 @@
-from .radiomics_dataset import RadiomicsDataset
+__all__ = ["RadiomicsDataset", "RadiomicsFeatureExtractor"]
 
-try:
-    from radiomics.featureextractor import RadiomicsFeatureExtractor
-except ImportError:
-    pass
+
+def __getattr__(name):
+    """Lazily resolve the radiomics classes so that the heavy pyradiomics import (which pulls in SimpleITK, scipy
+    and the full feature extractor machinery) is only paid on first access instead of at 'import delia' time."""
+    if name == "RadiomicsDataset":
+        from .radiomics_dataset import RadiomicsDataset
+        globals()[name] = RadiomicsDataset
+        return RadiomicsDataset
+    elif name == "RadiomicsFeatureExtractor":
+        from radiomics.featureextractor import RadiomicsFeatureExtractor
+        globals()[name] = RadiomicsFeatureExtractor
+        return RadiomicsFeatureExtractor
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
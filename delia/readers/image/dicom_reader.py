@@ -10,6 +10,7 @@
 """
 
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from glob import glob
 import logging
 import os
@@ -72,7 +73,8 @@ class DicomReader:
     @staticmethod
     def get_dicom_header(
             path_to_dicom: str,
-            show: bool = False
+            show: bool = False,
+            specific_tags: Optional[List[str]] = None
     ) -> pydicom.dataset.FileDataset:
         """
         Get a dicom header given the path to the dicom.
@@ -83,13 +85,22 @@ class DicomReader:
             The path to the dicom file.
         show : bool
             Show dicom header in console.
+        specific_tags : Optional[List[str]]
+            If given, only the listed tags are parsed; otherwise the whole header is read. Either way, values larger
+            than 1 KB (overlays, LUTs, large private blocks) are deferred and only loaded from disk if actually
+            accessed, which keeps the eager parse small without dropping any element.
 
         Returns
         -------
         loaded_dicom : pydicom.dataset.FileDataset
             Loaded DICOM dataset.
         """
-        loaded_dicom = pydicom.dcmread(path_to_dicom, stop_before_pixels=True)
+        loaded_dicom = pydicom.dcmread(
+            path_to_dicom,
+            stop_before_pixels=True,
+            specific_tags=specific_tags,
+            defer_size="1 KB"
+        )
 
         if show:
             _logger.info(loaded_dicom)
@@ -141,7 +152,13 @@ class DicomReader:
 
         paths_and_headers_for_each_series = defaultdict(list)
         for path in paths:
-            dicom_header = self.get_dicom_header(path_to_dicom=path)
+            # This scan only groups and sorts files, so the read is restricted to the two tags used here; the full
+            # header of each series is read once afterwards, from its first file only.
+            dicom_header = pydicom.dcmread(
+                path,
+                stop_before_pixels=True,
+                specific_tags=["SeriesInstanceUID", "SliceLocation"]
+            )
             paths_and_headers_for_each_series[dicom_header.SeriesInstanceUID].append((path, dicom_header))
 
         paths_to_dicoms_from_series = defaultdict(list)
@@ -171,17 +188,31 @@ class DicomReader:
         """
         series_data_dict: Dict[str, DicomReader.SeriesData] = {}
         all_patient_ids: Set[str] = set()
-        for series_id, paths in self.__get_paths_to_dicoms_from_series(self._path_to_patient_folder).items():
-            path_to_first_dicom_of_series = paths[0]
-            loaded_dicom_header = self.get_dicom_header(path_to_dicom=path_to_first_dicom_of_series)
-            all_patient_ids.add(loaded_dicom_header.PatientID)
-
-            series_data = self.SeriesData(
-                tag_value=self._get_tag_value(loaded_dicom_header, self.tag),
-                paths_to_dicoms_from_series=paths,
-                dicom_header=loaded_dicom_header
-            )
-            series_data_dict[series_id] = series_data
+        paths_to_dicoms_from_series = self.__get_paths_to_dicoms_from_series(self._path_to_patient_folder)
+
+        if paths_to_dicoms_from_series:
+            # Reading the first header of each series is I/O-bound and pydicom releases the GIL during file reads,
+            # so the per-series reads are fanned out across threads. The headers come back in submission order, which
+            # keeps the dictionary deterministic; all merging happens on the main thread.
+            with ThreadPoolExecutor(max_workers=min(8, len(paths_to_dicoms_from_series))) as executor:
+                loaded_dicom_headers = list(
+                    executor.map(
+                        lambda paths: self.get_dicom_header(path_to_dicom=paths[0]),
+                        paths_to_dicoms_from_series.values()
+                    )
+                )
+
+            for (series_id, paths), loaded_dicom_header in zip(
+                    paths_to_dicoms_from_series.items(), loaded_dicom_headers
+            ):
+                all_patient_ids.add(loaded_dicom_header.PatientID)
+
+                series_data = self.SeriesData(
+                    tag_value=self._get_tag_value(loaded_dicom_header, self.tag),
+                    paths_to_dicoms_from_series=paths,
+                    dicom_header=loaded_dicom_header
+                )
+                series_data_dict[series_id] = series_data
 
         if len(all_patient_ids) == 0:
             raise AssertionError(f"The patient folder must contain DICOM files. This is not the case for the patient "
@@ -10,13 +10,22 @@
 """
 
 from abc import ABC, abstractmethod
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from os import remove
 from typing import Dict, List, Optional, Tuple, Union
 
 import pydicom
 
 from delia.readers.image.dicom_reader import DicomReader
-from delia.utils.data_model import ImageDataModel, PatientDataModel
+from delia.readers.segmentation.segmentation_reader import SegmentationReader
+from delia.utils.data_model import ImageDataModel, PatientDataModel, SegmentationDataModel
+
+_TAG_REFERENCED_SERIES_SEQUENCE = (0x0008, 0x1115)
+_TAG_REFERENCED_FRAME_OF_REFERENCE_SEQUENCE = (0x3006, 0x0010)
+_TAG_RT_REFERENCED_STUDY_SEQUENCE = (0x3006, 0x0012)
+_TAG_RT_REFERENCED_SERIES_SEQUENCE = (0x3006, 0x0014)
+_TAG_SERIES_INSTANCE_UID = (0x0020, 0x000E)
 
 
 class BasePatientDataFactory(ABC):
@@ -60,8 +69,27 @@ class BasePatientDataFactory(ABC):
         self._erase_unused_dicom_files = erase_unused_dicom_files
         self.tag = tag
 
-        dicom_reader = DicomReader(path_to_patient_folder=self._path_to_patient_folder, tag=self.tag)
-        self._images_data = dicom_reader.get_images_data(remove_segmentations=True)
+        self._images_data = None
+        self._segmentation_data_cache = {}
+        self._segmentation_headers = None
+
+    @property
+    def _images(self) -> List[ImageDataModel]:
+        """
+        The patient's images data, loaded lazily. Factories release this list once the patient data model is built so
+        that full-volume images which did not make it into the model (e.g. series filtered out by tag value) are
+        freed as soon as possible; a later access simply re-reads the patient folder.
+
+        Returns
+        -------
+        images_data : List[ImageDataModel]
+            A list of the patient's images data.
+        """
+        if self._images_data is None:
+            dicom_reader = DicomReader(path_to_patient_folder=self._path_to_patient_folder, tag=self.tag)
+            self._images_data = dicom_reader.get_images_data(remove_segmentations=True)
+
+        return self._images_data
 
     @property
     def patient_id(self) -> str:
@@ -73,7 +101,7 @@ class BasePatientDataFactory(ABC):
         patient_id : str
             Patient ID.
         """
-        patient_id = self._images_data[0].dicom_header.PatientID
+        patient_id = self._images[0].dicom_header.PatientID
 
         return str(patient_id)
 
@@ -104,19 +132,124 @@ class BasePatientDataFactory(ABC):
         reference_uid : pydicom.DataElement
             Reference UID of the medical image on which the contouring was performed.
         """
-        if hasattr(segmentation_header, "ReferencedSeriesSequence"):
-            return segmentation_header.ReferencedSeriesSequence[0].SeriesInstanceUID
-        elif hasattr(segmentation_header, "ReferencedFrameOfReferenceSequence"):
-            referenced_frame_of_reference_sequence = segmentation_header.ReferencedFrameOfReferenceSequence
-            rt_referenced_study_sequence = referenced_frame_of_reference_sequence[0].RTReferencedStudySequence
-            rt_referenced_series_sequence = rt_referenced_study_sequence[0].RTReferencedSeriesSequence
-            return rt_referenced_series_sequence[0].SeriesInstanceUID
-        else:
-            raise AssertionError(
-                "The segmentation DICOM header must contain either the 'ReferencedSeriesSequence' attribute or "
-                "the 'ReferencedFrameOfReferenceSequence' attribute to associate the segmentation with the "
-                "corresponding medical image."
+        # Direct tag lookups skip pydicom's keyword-to-tag resolution on every attribute access, which matters when
+        # many segmentation headers are resolved in a row.
+        referenced_series_sequence = segmentation_header.get(_TAG_REFERENCED_SERIES_SEQUENCE)
+        if referenced_series_sequence is not None:
+            return referenced_series_sequence.value[0][_TAG_SERIES_INSTANCE_UID].value
+
+        referenced_frame_of_reference_sequence = segmentation_header.get(_TAG_REFERENCED_FRAME_OF_REFERENCE_SEQUENCE)
+        if referenced_frame_of_reference_sequence is not None:
+            rt_referenced_study_sequence = referenced_frame_of_reference_sequence.value[0][
+                _TAG_RT_REFERENCED_STUDY_SEQUENCE
+            ]
+            rt_referenced_series_sequence = rt_referenced_study_sequence.value[0][_TAG_RT_REFERENCED_SERIES_SEQUENCE]
+            return rt_referenced_series_sequence.value[0][_TAG_SERIES_INSTANCE_UID].value
+
+        raise AssertionError(
+            "The segmentation DICOM header must contain either the 'ReferencedSeriesSequence' attribute or "
+            "the 'ReferencedFrameOfReferenceSequence' attribute to associate the segmentation with the "
+            "corresponding medical image."
+        )
+
+    def _get_paths_to_segmentations_by_reference_uid(self) -> Dict[str, List[str]]:
+        """
+        Group the paths to the patient's segmentation files by the series UID of the image each segmentation
+        references. Each segmentation header is read exactly once here, so the association between an image series and
+        its segmentations becomes a dictionary lookup instead of one header read per (image, segmentation) pair.
+
+        Returns
+        -------
+        paths_to_segmentations_by_reference_uid : Dict[str, List[str]]
+            A dictionary mapping a referenced series UID to the list of paths to the segmentation files that reference
+            this series.
+        """
+        paths_to_segmentations_by_reference_uid = defaultdict(list)
+        for path_to_segmentation in self._paths_to_segmentations:
+            # Only the reference sequences are needed to associate a segmentation with its image series, so the
+            # header read is restricted to those tags.
+            segmentation_header = pydicom.dcmread(
+                path_to_segmentation,
+                stop_before_pixels=True,
+                specific_tags=["ReferencedSeriesSequence", "ReferencedFrameOfReferenceSequence"]
             )
+            reference_uid = self.get_segmentation_reference_uid(segmentation_header)
+            paths_to_segmentations_by_reference_uid[reference_uid].append(path_to_segmentation)
+
+        return paths_to_segmentations_by_reference_uid
+
+    def _get_prefetched_segmentation_header(self, path_to_segmentation: str) -> Optional[pydicom.dataset.FileDataset]:
+        """
+        Get the prefetched header of a given segmentation file. On the first call, the headers of all the patient's
+        segmentation files are read concurrently : the reads are independent and I/O-bound, so a thread pool overlaps
+        the disk latency across files instead of paying it once per file.
+
+        Parameters
+        ----------
+        path_to_segmentation : str
+            The path to the segmentation file.
+
+        Returns
+        -------
+        segmentation_header : Optional[pydicom.dataset.FileDataset]
+            The loaded segmentation header, or None if the path is not one of the patient's segmentation files.
+        """
+        if self._segmentation_headers is None:
+            paths = self._paths_to_segmentations or []
+
+            def read_header(path: str) -> pydicom.dataset.FileDataset:
+                return pydicom.dcmread(path, stop_before_pixels=True, defer_size="1 KB")
+
+            if paths:
+                with ThreadPoolExecutor(max_workers=min(8, len(paths))) as executor:
+                    self._segmentation_headers = dict(zip(paths, executor.map(read_header, paths)))
+            else:
+                self._segmentation_headers = {}
+
+        return self._segmentation_headers.get(path_to_segmentation)
+
+    def _get_segmentation_data(self, image: ImageDataModel, path_to_segmentation: str) -> SegmentationDataModel:
+        """
+        Get the segmentation data of a given segmentation file rasterized on a given image's grid. The result is
+        memoized : rasterization is the heaviest step of segmentation reading, so when the same segmentation file is
+        requested again for an image with an identical grid (e.g. on a repeated 'create_patient_data' call), the
+        cached data is returned instead of being rebuilt.
+
+        Parameters
+        ----------
+        image : ImageDataModel
+            A named tuple grouping the patient's dicom header, its medical image as a simpleITK image and a sequence of
+            the paths to each dicom contained in the series.
+        path_to_segmentation : str
+            The path to the segmentation file.
+
+        Returns
+        -------
+        segmentation_data : SegmentationDataModel
+            A named tuple grouping the segmentation data.
+        """
+        simple_itk_image = image.simple_itk_image
+        key = (
+            path_to_segmentation,
+            simple_itk_image.GetSize(),
+            simple_itk_image.GetSpacing(),
+            simple_itk_image.GetOrigin(),
+            simple_itk_image.GetDirection(),
+            tuple(sorted(self._organs)) if self._organs else None
+        )
+
+        segmentation_data = self._segmentation_data_cache.get(key)
+        if segmentation_data is None:
+            segmentation_reader = SegmentationReader(
+                image=image,
+                path_to_segmentation=path_to_segmentation,
+                organs=self._organs,
+                segmentation_dicom_header=self._get_prefetched_segmentation_header(path_to_segmentation)
+            )
+            segmentation_data = segmentation_reader.get_segmentation_data()
+            self._segmentation_data_cache[key] = segmentation_data
+
+        return segmentation_data
 
     @staticmethod
     def erase_dicom_files(image: ImageDataModel):
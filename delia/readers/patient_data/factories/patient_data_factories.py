@@ -8,11 +8,11 @@
     @Description:       This file contains all factories that inherit from the BasePatientDataFactory class.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from os import remove
 from typing import Dict, List, Optional, Tuple, Union
 
 from delia.readers.patient_data.factories.base_patient_data_factory import BasePatientDataFactory
-from delia.readers.image.dicom_reader import DicomReader
-from delia.readers.segmentation.segmentation_reader import SegmentationReader
 from delia.utils.data_model import ImageAndSegmentationDataModel, PatientDataModel
 
 
@@ -69,21 +69,17 @@ class DefaultPatientDataFactory(BasePatientDataFactory):
         patient_data: PatientDataModel
             Patient data.
         """
+        paths_to_segmentations_by_reference_uid = self._get_paths_to_segmentations_by_reference_uid()
+
         data = []
-        for image_idx, image in enumerate(self._images_data):
+        for image_idx, image in enumerate(self._images):
             segmentations = []
-            for path_to_segmentation in self._paths_to_segmentations:
-                seg_header = DicomReader.get_dicom_header(path_to_dicom=path_to_segmentation)
-                reference_uid = self.get_segmentation_reference_uid(seg_header)
-
-                if image.dicom_header.SeriesInstanceUID == reference_uid:
-                    segmentation_reader = SegmentationReader(
-                        image=image,
-                        path_to_segmentation=path_to_segmentation,
-                        organs=self._organs
-                    )
-
-                    segmentations.append(segmentation_reader.get_segmentation_data())
+            for path_to_segmentation in paths_to_segmentations_by_reference_uid.get(
+                    image.dicom_header.SeriesInstanceUID, []
+            ):
+                segmentations.append(
+                    self._get_segmentation_data(image=image, path_to_segmentation=path_to_segmentation)
+                )
 
             if segmentations:
                 image_and_segmentation_data = ImageAndSegmentationDataModel(
@@ -100,6 +96,10 @@ class DefaultPatientDataFactory(BasePatientDataFactory):
             patient_path=self.patient_path,
             data=data
         )
+        # Images that were not added to the model (and the list itself) are released here; the model keeps its own
+        # references to the images it contains.
+        self._images_data = None
+
         return patient_data
 
 
@@ -156,50 +156,60 @@ class SpecificTagPatientDataFactory(BasePatientDataFactory):
         patient_data: PatientDataModel
             Patient data.
         """
+        paths_to_segmentations_by_reference_uid = self._get_paths_to_segmentations_by_reference_uid()
+
+        # Invert the tag values mapping once so matching an image becomes a dictionary lookup instead of a scan of
+        # every tag value list per image; the first series key declaring a value wins, as in the previous scan order.
+        series_key_by_tag_value = {}
+        for series_key, list_of_tag_values in self._tag_values.items():
+            for tag_value in list_of_tag_values:
+                series_key_by_tag_value.setdefault(tag_value, series_key)
+
         data = []
-        for image_idx, image in enumerate(self._images_data):
-            image_added = False
+        paths_to_dicoms_to_erase = []
+        for image_idx, image in enumerate(self._images):
             if isinstance(image.dicom_header[self.tag].value, str):
                 tag_value = image.dicom_header[self.tag].value
             else:
                 tag_value = image.dicom_header[self.tag].repval
-            for series_key, list_of_tag_values in self._tag_values.items():
-                if tag_value in list_of_tag_values:
-                    image.series_key = series_key
-
-                    segmentations = []
-                    for path_to_segmentation in self._paths_to_segmentations:
-                        seg_header = DicomReader.get_dicom_header(path_to_dicom=path_to_segmentation)
-                        reference_uid = self.get_segmentation_reference_uid(seg_header)
-
-                        if image.dicom_header.SeriesInstanceUID == reference_uid:
-                            segmentation_reader = SegmentationReader(
-                                image=image,
-                                path_to_segmentation=path_to_segmentation,
-                                organs=self._organs
-                            )
-
-                            segmentations.append(segmentation_reader.get_segmentation_data())
-
-                    if segmentations:
-                        image_and_segmentation_data = ImageAndSegmentationDataModel(
-                            image=image,
-                            segmentations=segmentations
-                        )
-                        data.append(image_and_segmentation_data)
-                    else:
-                        image_data = ImageAndSegmentationDataModel(image=image)
-                        data.append(image_data)
-
-                    image_added = True
-                    break
-
-            if image_added is False and self._erase_unused_dicom_files:
-                self.erase_dicom_files(image)
+
+            series_key = series_key_by_tag_value.get(tag_value)
+            if series_key is not None:
+                image.series_key = series_key
+
+                segmentations = []
+                for path_to_segmentation in paths_to_segmentations_by_reference_uid.get(
+                        image.dicom_header.SeriesInstanceUID, []
+                ):
+                    segmentations.append(
+                        self._get_segmentation_data(image=image, path_to_segmentation=path_to_segmentation)
+                    )
+
+                if segmentations:
+                    image_and_segmentation_data = ImageAndSegmentationDataModel(
+                        image=image,
+                        segmentations=segmentations
+                    )
+                    data.append(image_and_segmentation_data)
+                else:
+                    image_data = ImageAndSegmentationDataModel(image=image)
+                    data.append(image_data)
+            elif self._erase_unused_dicom_files:
+                paths_to_dicoms_to_erase.extend(image.paths_to_dicoms)
 
         patient_data = PatientDataModel(
             patient_id=self.patient_id,
             patient_path=self.patient_path,
             data=data
         )
+        # Images that were not added to the model (and the list itself) are released here; the model keeps its own
+        # references to the images it contains.
+        self._images_data = None
+
+        if paths_to_dicoms_to_erase:
+            # Deletion is deferred until the whole patient was assembled, so a failure mid-factory never erases user
+            # data; the thread pool hides per-file syscall latency on network filesystems.
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(remove, paths_to_dicoms_to_erase))
+
         return patient_data
@@ -9,6 +9,7 @@
                         strategies are types of requests the client could ask the PatientDataReader class.
 """
 
+from functools import cached_property
 from typing import Dict, List, Optional, Tuple, Union
 
 from delia.utils.data_model import PatientDataModel
@@ -72,10 +73,12 @@ class PatientDataQueryContext:
         else:
             return PatientDataQueryStrategies.DEFAULT.value
 
-    @property
+    @cached_property
     def _patient_data_factory_instance(self) -> PatientDataQueryStrategy.factory:
         """
-        The factory class instance corresponding to the class of the given patient data strategy.
+        The factory class instance corresponding to the class of the given patient data strategy. The instance is
+        cached : constructing a factory scans the whole patient folder through the DicomReader, so repeated accesses
+        (e.g. a second 'create_patient_data' call) must not re-parse every DICOM header.
 
         Returns
         -------
@@ -142,19 +142,25 @@ class PatientDataReader(DicomReader):
             from the patient's file. Keys are arbitrary names given to the images we want to add and values are lists of
             values associated with the specified tag.
         """
-        items = list(tag_values.items())
-        for previous_items, current_items in zip(items, items[1:]):
-            set_intersection = set(previous_items[1]) & set(current_items[1])
+        # Each list is converted to a set once and checked against the union of all previous ones, so the overlap
+        # check is linear in the total number of tag values instead of quadratic in the number of images.
+        sets = [(series_key, set(values)) for series_key, values in tag_values.items()]
+        seen = set()
+        for series_key, tag_value_set in sets:
+            set_intersection = tag_value_set & seen
 
             if bool(set_intersection):
+                previous_key = next(key for key, values in sets if key != series_key and values & set_intersection)
                 raise AssertionError(
                     f"\nThe dictionary of tag values should not contain the same series names for different "
-                    f"images/modalities. \nHowever, here we find the series names {previous_items[1]} for the "
-                    f"{previous_items[0]} image and {current_items[1]} for the {current_items[0]} image. \nClearly, "
+                    f"images/modalities. \nHowever, here we find the series names {tag_values[previous_key]} for the "
+                    f"{previous_key} image and {tag_values[series_key]} for the {series_key} image. \nClearly, "
                     f"the images series values are overlapping because of the series named {set_intersection}."
                 )
 
-        self.tag_values = tag_values
+            seen |= tag_value_set
+
+        self._tag_values = tag_values
 
     @property
     def available_tag_values(self) -> List[str]:
@@ -177,14 +183,18 @@ class PatientDataReader(DicomReader):
         Check availability of given value for specified tag in the patient's dicom files.
         """
         _logger.debug("Checking availability of given value for specified tag...")
+        # The property re-reads the tag from every header on each access; evaluate it once for the whole check and
+        # use a set for the membership tests.
+        available_tag_values = self.available_tag_values
+        available_tag_values_set = set(available_tag_values)
         for series_key, tag_value_list in self.tag_values.items():
-            if any(series in self.available_tag_values for series in tag_value_list):
+            if any(series in available_tag_values_set for series in tag_value_list):
                 pass
             else:
-                self.record_failed_images(series_key)
+                self.record_failed_images(series_key, available_tag_values=available_tag_values)
         _logger.debug("Done.")
 
-    def record_failed_images(self, series_key: str) -> None:
+    def record_failed_images(self, series_key: str, available_tag_values: Optional[List[str]] = None) -> None:
         """
         Record failed images.
 
@@ -192,11 +202,17 @@ class PatientDataReader(DicomReader):
         ----------
         series_key : str
             Series key.
+        available_tag_values : Optional[List[str]]
+            Available values of the specified tag in the patient dicom files. If None, they are read from the
+            patient's headers.
         """
+        if available_tag_values is None:
+            available_tag_values = self.available_tag_values
+
         _logger.error(
             f"Patient with ID {self.patient_id} has no series available that correlates with the image '{series_key}'. "
             f"The expected values of specified tag for this image are {self.tag_values[series_key]} while the "
-            f"patient record only contains the following values: {self.available_tag_values}."
+            f"patient record only contains the following values: {available_tag_values}."
         )
 
         self.failed_images.append(series_key)
@@ -237,9 +253,16 @@ class PatientDataReader(DicomReader):
         if transforms:
             apply_transforms(patient_dataset=patient_dataset, transforms=transforms)
 
+        patient_dataset.transforms_history = TransformsHistory(transforms)
+
         _logger.debug(
             f"Chosen patient data query strategy: '{patient_data_context.patient_data_query_strategy.name}'."
         )
+
+        # The loop below only produces log records; skip the whole per-image summary work when INFO is filtered out.
+        if not _logger.isEnabledFor(logging.INFO):
+            return patient_dataset
+
         _logger.info(f"{len(patient_dataset.data)} images added to the patient dataset, namely: ")
 
         for image_and_segmentation_data in patient_dataset.data:
@@ -249,8 +272,8 @@ class PatientDataReader(DicomReader):
             segmented_organs = set()
             if segmentations:
                 for segmentation in segmentations:
-                    for organ in list(segmentation.simple_itk_label_maps.keys()):
-                        segmented_organs.add(organ)
+                    # Iterating the dict yields its keys directly; one C-level update per segmentation.
+                    segmented_organs.update(segmentation.simple_itk_label_maps)
 
             if hasattr(image.dicom_header, "SeriesDescription"):
                 series_description = image.dicom_header.SeriesDescription
@@ -266,6 +289,4 @@ class PatientDataReader(DicomReader):
             if image_segmentation_available:
                 _logger.info(f"  Segmented organs : {segmented_organs}")
 
-        patient_dataset.transforms_history = TransformsHistory(transforms)
-
         return patient_dataset
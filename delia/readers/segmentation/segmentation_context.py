@@ -30,7 +30,8 @@ class SegmentationContext:
             self,
             image: ImageDataModel,
             path_to_segmentation: str,
-            organs: Optional[List[str]] = None
+            organs: Optional[List[str]] = None,
+            segmentation_dicom_header: Optional[pydicom.dataset.FileDataset] = None
     ):
         """
         Constructor of the SegmentationContext class.
@@ -44,10 +45,14 @@ class SegmentationContext:
             The path to the segmentation file.
         organs : Optional[List[str]]
             A set of the organs to segment.
+        segmentation_dicom_header : Optional[pydicom.dataset.FileDataset]
+            The already-loaded header of the segmentation file, if the caller prefetched it. When given, it seeds the
+            header cache so the context never re-reads the file.
         """
         self._image = image
         self._path_to_segmentation = path_to_segmentation
         self._organs = organs
+        self._segmentation_dicom_header = segmentation_dicom_header
 
     @property
     def path_to_segmentation(self) -> str:
@@ -72,6 +77,7 @@ class SegmentationContext:
             The path to the segmentation file.
         """
         self._path_to_segmentation = path_to_segmentation
+        self._segmentation_dicom_header = None
 
     @property
     def segmentation_modality(self) -> str:
@@ -103,9 +109,12 @@ class SegmentationContext:
         segmentation_dicom_header : pydicom.dataset.FileDataset
             Segmentation dicom header.
         """
-        header = pydicom.dcmread(self.path_to_segmentation, stop_before_pixels=True)
+        # The header is read once per context : 'segmentation_modality', 'segmentation_strategy' and the factory all
+        # access this property, and each dcmread is a full header parse. The cache is reset when the path changes.
+        if self._segmentation_dicom_header is None:
+            self._segmentation_dicom_header = pydicom.dcmread(self.path_to_segmentation, stop_before_pixels=True)
 
-        return header
+        return self._segmentation_dicom_header
 
     @property
     def segmentation_strategy(self) -> SegmentationStrategy:
@@ -118,7 +127,7 @@ class SegmentationContext:
             Segmentation strategy.
         """
         modality = self.segmentation_modality
-        for segmentation_category in list(SegmentationStrategies):
+        for segmentation_category in SegmentationStrategies:
             if modality == segmentation_category.value.modality:
                 return segmentation_category.value
 
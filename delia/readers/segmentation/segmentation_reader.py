@@ -11,6 +11,8 @@
 
 from typing import List, Optional
 
+import pydicom
+
 from .segmentation_context import SegmentationContext
 from .factories.segmentation import Segmentation
 from ...utils.data_model import ImageDataModel, SegmentationDataModel
@@ -26,7 +28,8 @@ class SegmentationReader:
             self,
             image: ImageDataModel,
             path_to_segmentation: str,
-            organs: Optional[List[str]] = None
+            organs: Optional[List[str]] = None,
+            segmentation_dicom_header: Optional[pydicom.dataset.FileDataset] = None
     ):
         """
         Constructor of the class SegmentationReader.
@@ -40,10 +43,14 @@ class SegmentationReader:
             The path to the segmentation file.
         organs : Optional[List[str]]
             A set of the organs to segment.
+        segmentation_dicom_header : Optional[pydicom.dataset.FileDataset]
+            The already-loaded header of the segmentation file, if the caller prefetched it. Forwarded to the
+            segmentation context so the file's header is not read again.
         """
         self._image = image
         self._path_to_segmentation = path_to_segmentation
         self._organs = organs
+        self._segmentation_dicom_header = segmentation_dicom_header
 
     @property
     def __segmentation_context_manager(self) -> SegmentationContext:
@@ -58,7 +65,8 @@ class SegmentationReader:
         return SegmentationContext(
             image=self._image,
             path_to_segmentation=self._path_to_segmentation,
-            organs=self._organs
+            organs=self._organs,
+            segmentation_dicom_header=self._segmentation_dicom_header
         )
 
     @property
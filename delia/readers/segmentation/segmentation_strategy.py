@@ -10,6 +10,7 @@
 """
 
 import enum
+from functools import lru_cache
 from typing import List, NamedTuple, Callable
 
 from .factories.dicom_segmentation_factories import (DicomSEGSegmentationFactory, RTStructSegmentationFactory)
@@ -55,9 +56,11 @@ class SegmentationStrategies(enum.Enum):
             )
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_available_modalities(cls) -> List[str]:
         """
-        Available segmentation DICOM modalities.
+        Available segmentation DICOM modalities. The enumeration is frozen at import time, so the list is built once
+        and memoized; this method is called for every series of every patient.
 
         Returns
         -------
@@ -9,7 +9,6 @@
                         images and segmentations.
 """
 
-from copy import deepcopy
 from typing import Dict, Hashable, NamedTuple, Union
 
 from monai.transforms import apply_transform as monai_apply_transform
@@ -137,6 +136,9 @@ def _apply_transform_on_images(
     for data in patient_dataset.data:
         image = data.image
         image.simple_itk_image = transformed_images_dict[image.transforms_key]
+        # 'numpy_array' is a cached_property over the simpleITK image; the cache must be dropped alongside the
+        # reassignment, otherwise readers would keep seeing the pre-transform voxels.
+        image.__dict__.pop("numpy_array", None)
 
 
 def _apply_transform_on_segmentations(
@@ -171,16 +173,22 @@ def _apply_transform_on_segmentations(
 
         if segmentations:
             for segmentation_data in segmentations:
-                temp_dict = deepcopy(images)
+                # A shallow copy is enough here : the transform application builds new images rather than mutating
+                # its inputs, and the organ entries added below must simply not leak into 'images'. Deep-copying
+                # would duplicate every reference image buffer once per segmentation.
+                temp_dict = dict(images)
                 for organ_name, label_map in segmentation_data.simple_itk_label_maps.items():
                     temp_dict[organ_name] = ImageData(simple_itk_image=label_map)
 
                 transformed_dict = _apply_transform(transform=transform, data=temp_dict, mode=Mode.SEGMENTATION)
 
-                for img_key in images.keys():
+                for img_key in images:
                     transformed_dict.pop(img_key)
 
                 segmentation_data.simple_itk_label_maps = transformed_dict
+                # 'numpy_array_label_maps' is a cached_property over the label maps; the cache must be dropped
+                # alongside the reassignment, otherwise readers would keep seeing the pre-transform label maps.
+                segmentation_data.__dict__.pop("numpy_array_label_maps", None)
 
 
 def _apply_transform(
@@ -56,7 +56,7 @@ class MatchingCentroidSpatialCropd(ArraySpaceTransform):
             input image will be used. For example: if the spatial size of input data is [40, 40, 40] and
             `roi_size=[32, 64, -1]`, the spatial size of output data will be [32, 40, 40].
         """
-        keys = [key for key in matching_keys] + [segmentation_key]
+        keys = (*matching_keys, segmentation_key)
         super().__init__(keys=keys)
 
         self._centroid = None
@@ -80,23 +80,38 @@ class MatchingCentroidSpatialCropd(ArraySpaceTransform):
         """
         d = dict(data)
 
+        number_of_foreground_voxels = None
         if self._mode == Mode.NONE:
             raise AssertionError("Transform mode must be set before __call__.")
         elif self._mode == Mode.IMAGE:
             assert self._centroid is not None, "'centroid' must be set before __call__ with image mode."
         elif self._mode == Mode.SEGMENTATION:
             if self._centroid is None:
-                self._centroid = compute_centroid(d[self._segmentation_key])
+                # The foreground count falls out of the centroid computation, sparing one full-volume scan below.
+                self._centroid, number_of_foreground_voxels = compute_centroid(
+                    d[self._segmentation_key], return_number_of_voxels=True
+                )
         else:
             raise ValueError("Unknown transform mode.")
 
+        # Hoisted out of the loop : attribute resolution on self is paid once per call instead of once per key.
+        segmentation_key = self._segmentation_key
         spatial_crop = SpatialCrop(roi_center=self._centroid, roi_size=self._roi_size)
+        # The crop object already holds the clamped slice bounds; applying them directly to plain numpy arrays gives
+        # a zero-copy view where MONAI's wrapper would copy. MetaTensors still go through the wrapper, which keeps
+        # their affine up to date.
+        slices = (Ellipsis, *spatial_crop.slices)
 
         for key in self.key_iterator(d):
-            if key == self._segmentation_key:
-                n_original_voxels = (d[key] == 1).sum().item()
-                d[key] = spatial_crop(d[key])
-                n_final_voxels = (d[key] == 1).sum().item()
+            if key == segmentation_key:
+                if number_of_foreground_voxels is None:
+                    # The label map is binary, so counting the non-zero voxels in one C loop avoids materializing
+                    # the '== 1' boolean array.
+                    number_of_foreground_voxels = int(np.count_nonzero(d[key]))
+                n_original_voxels = number_of_foreground_voxels
+                array = d[key]
+                d[key] = array[slices] if isinstance(array, np.ndarray) else spatial_crop(array)
+                n_final_voxels = int(np.count_nonzero(d[key]))
 
                 if n_original_voxels != n_final_voxels:
                     warn(
@@ -106,7 +121,8 @@ class MatchingCentroidSpatialCropd(ArraySpaceTransform):
                         f"{n_final_voxels}. The difference (in voxels) is {n_original_voxels - n_final_voxels}."
                     )
             else:
-                d[key] = spatial_crop(d[key])
+                array = d[key]
+                d[key] = array[slices] if isinstance(array, np.ndarray) else spatial_crop(array)
 
         if self._mode == Mode.IMAGE:
             self._centroid = None
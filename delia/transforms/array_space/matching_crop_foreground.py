@@ -44,7 +44,7 @@ class MatchingCropForegroundd(ArraySpaceTransform):
             'tag_values'. For the label maps, the keys are organ names. Note that if 'tag_values' is
             None, the image keys are assumed to be modality names.
         """
-        keys = [key for key in matching_keys] + [reference_image_key]
+        keys = (*matching_keys, reference_image_key)
         super().__init__(keys=keys)
 
         self._reference_image_key = reference_image_key
@@ -67,16 +67,36 @@ class MatchingCropForegroundd(ArraySpaceTransform):
         """
         d = dict(data)
 
+        # 'key_iterator' validates the keys against the data on every call; materialize it once and reuse the tuple
+        # for both passes. The reference key is hoisted to a local for the same reason.
+        keys = tuple(self.key_iterator(d))
+        reference_image_key = self._reference_image_key
+
         start, end = None, None
-        for key in self.key_iterator(d):
-            if key == self._reference_image_key:
+        for key in keys:
+            if key == reference_image_key:
+                # The shape must be captured before cropping : the cropped reference always matches the bounding
+                # box trivially, which would make the identity check below fire on any box anchored at 0.
+                pre_crop_shape = d[key].shape
                 d[key], start, end = self._crop_foreground(d[key])
 
-        spatial_crop = SpatialCrop(roi_start=start, roi_end=end)
+        # When the foreground bounding box spans the whole reference image (common for volumes that were already
+        # cropped upstream), the crop is an identity operation : applying it anyway would copy every matching volume.
+        start, end = np.asarray(start), np.asarray(end)
+        spatial_shape = np.asarray(pre_crop_shape[-len(end):])
+        if np.array_equal(start, np.zeros_like(start)) and np.array_equal(end, spatial_shape):
+            return d
 
-        for key in self.key_iterator(d):
-            if key != self._reference_image_key:
-                d[key] = spatial_crop(d[key])
+        spatial_crop = SpatialCrop(roi_start=start, roi_end=end)
+        # The crop object already holds the clamped slice bounds; applying them directly to plain numpy arrays gives
+        # a zero-copy view where MONAI's wrapper would copy. MetaTensors still go through the wrapper, which keeps
+        # their affine up to date.
+        slices = (Ellipsis, *spatial_crop.slices)
+
+        for key in keys:
+            if key != reference_image_key:
+                array = d[key]
+                d[key] = array[slices] if isinstance(array, np.ndarray) else spatial_crop(array)
 
         return d
 
@@ -16,7 +16,10 @@ from monai.data import MetaTensor
 from ..tools import convert_to_numpy
 
 
-def compute_centroid(array: Union[MetaTensor, np.ndarray]) -> Tuple[int, int, int]:
+def compute_centroid(
+        array: Union[MetaTensor, np.ndarray],
+        return_number_of_voxels: bool = False
+) -> Union[Tuple[int, int, int], Tuple[Tuple[int, int, int], int]]:
     """
     Computes centroid.
 
@@ -24,17 +27,34 @@ def compute_centroid(array: Union[MetaTensor, np.ndarray]) -> Tuple[int, int, in
     ----------
     array : Union[MetaTensor, np.ndarray]
         Image tensor or array.
+    return_number_of_voxels : bool
+        Whether to also return the number of foreground voxels, default = False. The count falls out of the centroid
+        computation for free, so callers that need it can avoid a second full-volume scan.
 
     Returns
     -------
-    centroid : Tuple[int, int, int]
-        Centroid.
+    centroid : Union[Tuple[int, int, int], Tuple[Tuple[int, int, int], int]]
+        Centroid, or a (centroid, number of foreground voxels) tuple if 'return_number_of_voxels' is True.
     """
     np_array = convert_to_numpy(array)
-    assert np.array_equal(np_array, np_array.astype(bool)), (
-        "The array to compute the centroid on must be a binary numpy array."
-    )
-    binary_array = (np_array == 1)
-    centroid = np.argwhere(binary_array).sum(0)/binary_array.sum()
+    if np_array.dtype == bool:
+        pass
+    elif np.issubdtype(np_array.dtype, np.integer):
+        # Two cheap reductions replace the full-array equality check, which allocated a complete boolean copy.
+        assert np_array.min() >= 0 and np_array.max() <= 1, (
+            "The array to compute the centroid on must be a binary numpy array."
+        )
+    else:
+        assert np.array_equal(np_array, np_array.astype(bool)), (
+            "The array to compute the centroid on must be a binary numpy array."
+        )
+
+    # np.nonzero streams the coordinates per axis, avoiding the (N, ndim) index matrix that np.argwhere would
+    # materialize for large volumes.
+    coordinates = np.nonzero(np_array)
+    centroid = np.fromiter((axis.mean() for axis in coordinates), dtype=np.float64, count=np_array.ndim)
+
+    if return_number_of_voxels:
+        return centroid.astype(int), int(coordinates[0].size)
 
     return centroid.astype(int)
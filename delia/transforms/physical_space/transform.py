@@ -10,7 +10,7 @@
 """
 
 from abc import abstractmethod
-from typing import Collection, Dict, Hashable, NamedTuple, Union
+from typing import Collection, Dict, Hashable, Union
 
 import SimpleITK as sitk
 import pydicom
@@ -21,9 +21,11 @@ from ..tools import Mode
 KeysCollection = Union[Collection[Hashable], Hashable]
 
 
-class ImageData(NamedTuple):
+class ImageData:
     """
-    A named tuple the medical image as a simpleITK image and its dicom header.
+    A class grouping the medical image as a simpleITK image and its dicom header. Slotted rather than a NamedTuple :
+    attribute access goes through a plain slot descriptor instead of a property plus tuple indexing, which is
+    noticeably cheaper in the per-key transform loops where these objects are read.
 
     Elements
     --------
@@ -32,8 +34,11 @@ class ImageData(NamedTuple):
     dicom_header : FileDataset
         Dicom header dataset.
     """
-    simple_itk_image: sitk.Image
-    dicom_header: pydicom.dataset.FileDataset = None
+    __slots__ = ("simple_itk_image", "dicom_header")
+
+    def __init__(self, simple_itk_image: sitk.Image, dicom_header: pydicom.dataset.FileDataset = None):
+        self.simple_itk_image = simple_itk_image
+        self.dicom_header = dicom_header
 
 
 class PhysicalSpaceTransform(MapTransform):
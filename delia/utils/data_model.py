@@ -10,6 +10,7 @@
 """
 
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Dict, Optional, List, Sequence
 
 import numpy as np
@@ -46,10 +47,15 @@ class SegmentationDataModel:
     modality: Optional[str] = None
     simple_itk_label_maps: Optional[Dict[str, sitk.Image]] = None
 
-    @property
+    @cached_property
     def numpy_array_label_maps(self) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Label maps as read-only numpy arrays. The arrays are views on the pixel buffers of the simpleITK label maps,
+        so no copy is made; the dictionary is built once and cached on the instance for any further access. Callers
+        that need to mutate a label map must copy it explicitly.
+        """
         if self.simple_itk_label_maps:
-            return {k: sitk.GetArrayFromImage(v) for k, v in self.simple_itk_label_maps.items()}
+            return {k: sitk.GetArrayViewFromImage(v) for k, v in self.simple_itk_label_maps.items()}
         else:
             return None
 
@@ -80,8 +86,21 @@ class ImageDataModel:
     transforms_key: Optional[str] = None
 
     @property
+    def numpy_array_view(self) -> np.ndarray:
+        """
+        Image as a read-only numpy array view on the simpleITK pixel buffer. No copy is made, so the view is only
+        valid as long as the simpleITK image is alive and unmodified.
+        """
+        return sitk.GetArrayViewFromImage(self.simple_itk_image)
+
+    @cached_property
     def numpy_array(self) -> np.ndarray:
-        return sitk.GetArrayFromImage(self.simple_itk_image)
+        """
+        Image as a read-only numpy array. The array is a view on the simpleITK pixel buffer, so no copy is made; it
+        is cached on the instance for any further access. Callers that need to mutate the voxels must copy it
+        explicitly.
+        """
+        return np.asarray(self.numpy_array_view)
 
 
 @dataclass